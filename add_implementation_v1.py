@@ -1,33 +1,133 @@
 """
-Example kernel implementation for tensor addition using CuteDSL.
+Example kernel implementation for tensor addition using Triton.
 This is a sample implementation for demonstration purposes.
 """
 
-def add_tensor(a, b, output):
+import os
+from pathlib import Path
+
+# Importing this module points the process's Triton cache (compiled kernels
+# and autotune results) at ~/.leaderboard/kernel_cache, unless
+# TRITON_CACHE_DIR is already set.
+KERNEL_CACHE_DIR = Path.home() / '.leaderboard' / 'kernel_cache'
+os.environ.setdefault('TRITON_CACHE_DIR', str(KERNEL_CACHE_DIR))
+
+import torch
+import triton
+import triton.language as tl
+
+
+# Autotuned warp counts; LEADERBOARD_TPB must select one of them
+NUM_WARPS = (2, 4, 8)
+THREADS_PER_BLOCK = tuple(w * 32 for w in NUM_WARPS)
+
+
+def _threads_per_block_override():
+    """Parse LEADERBOARD_TPB, failing at import rather than inside the autotuner."""
+    value = os.environ.get('LEADERBOARD_TPB')
+    if not value:
+        return None
+
+    try:
+        threads = int(value)
+    except ValueError:
+        threads = None
+    if threads not in THREADS_PER_BLOCK:
+        raise ValueError(
+            f"LEADERBOARD_TPB must be one of {THREADS_PER_BLOCK}, got {value!r}"
+        )
+    return threads
+
+
+LEADERBOARD_TPB = _threads_per_block_override()
+
+
+def _prune_configs(configs, named_args, **kwargs):
+    """Restrict tuning to LEADERBOARD_TPB threads per block when it is set."""
+    if LEADERBOARD_TPB is None:
+        return configs
+
+    return [c for c in configs if c.num_warps * 32 == LEADERBOARD_TPB]
+
+
+@triton.autotune(
+    configs=[
+        triton.Config({'BLOCK_SIZE': b}, num_warps=w, num_stages=s)
+        for b in (256, 512, 1024, 2048, 4096)
+        for w in NUM_WARPS
+        for s in (2, 3, 4)
+    ],
+    key=['n'],
+    prune_configs_by={'early_config_prune': _prune_configs},
+    cache_results=True,
+)
+@triton.jit
+def add_tensor(
+    a_ptr, b_ptr, output_ptr, n,
+    BLOCK_SIZE: tl.constexpr,
+    WORK_PER_THREAD: tl.constexpr,
+):
     """
     Add two tensors element-wise.
-    
+
+    Programs walk the input with a grid-stride loop, each step covering
+    WORK_PER_THREAD consecutive BLOCK_SIZE-wide tiles, so the grid can stay
+    sized to the GPU instead of to the tensor.
+
     Args:
-        a: Input tensor A
-        b: Input tensor B
-        output: Output tensor for storing A + B
+        a_ptr: Pointer to input tensor A
+        b_ptr: Pointer to input tensor B
+        output_ptr: Pointer to output tensor for storing A + B
+        n: Number of elements
+        BLOCK_SIZE: Elements per tile (chosen by the autotuner)
+        WORK_PER_THREAD: Tiles processed per program per loop step
     """
-    # CuteDSL implementation
-    blockIdx_x = get_block_idx_x()
-    threadIdx_x = get_thread_idx_x()
-    
-    idx = blockIdx_x * blockDim_x + threadIdx_x
-    
-    if idx < a.size:
-        output[idx] = a[idx] + b[idx]
-    
-    return output
-
-
-def kernel_config():
-    """Return kernel configuration parameters."""
+    pid = tl.program_id(0)
+    num_programs = tl.num_programs(0)
+    TILE: tl.constexpr = BLOCK_SIZE * WORK_PER_THREAD
+
+    for start in range(pid * TILE, n, num_programs * TILE):
+        for w in tl.static_range(WORK_PER_THREAD):
+            offsets = start + w * BLOCK_SIZE + tl.arange(0, BLOCK_SIZE)
+            mask = offsets < n
+
+            a = tl.load(a_ptr + offsets, mask=mask)
+            b = tl.load(b_ptr + offsets, mask=mask)
+            tl.store(output_ptr + offsets, a + b, mask=mask)
+
+
+def _blocks_per_sm(kernel, props):
+    """Resident programs per SM for a compiled kernel, from its resource usage."""
+    threads = kernel.metadata.num_warps * 32
+    limits = [props.max_threads_per_multi_processor // threads]
+    if kernel.n_regs:
+        limits.append(props.regs_per_multiprocessor // (kernel.n_regs * threads))
+    if kernel.metadata.shared:
+        limits.append(props.shared_memory_per_multiprocessor // kernel.metadata.shared)
+    return max(min(limits), 1)
+
+
+def kernel_config(n, kernel=None):
+    """Return kernel configuration parameters for an input of n elements.
+
+    BLOCK_SIZE, num_warps and num_stages are picked by the autotuner, so the
+    grid is returned as a function of the selected meta-parameters. Passing
+    the compiled handle returned by a previous add_tensor launch as kernel
+    sizes the grid to one full wave at that kernel's register/shared-memory
+    occupancy; without it the grid is capped at 2 programs per SM.
+    """
+    work_per_thread = 4
+    props = torch.cuda.get_device_properties(torch.cuda.current_device())
+    sm_count = props.multi_processor_count
+    blocks_per_sm = 2 if kernel is None else _blocks_per_sm(kernel, props)
+    shared_memory = 0 if kernel is None else kernel.metadata.shared
+
+    def grid(meta):
+        tiles = triton.cdiv(n, meta['BLOCK_SIZE'] * meta['WORK_PER_THREAD'])
+        return (max(min(tiles, blocks_per_sm * sm_count), 1),)
+
     return {
-        'block_size': 256,
-        'grid_size': 'auto',
-        'shared_memory': 0
+        'WORK_PER_THREAD': work_per_thread,
+        'grid': grid,
+        'shared_memory': shared_memory
     }
@@ -1,16 +1,18 @@
 import click
-import requests
+from functools import lru_cache
 from typing import Optional
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt
 
-from .submit import submit_single_kernel, submit_directory_kernels
 from .config import save_token, load_token, load_config, clear_token
 
 
-console = Console()
+# requests, rich and the submit helpers are imported inside the commands that
+# need them so that fast commands like --help and whoami start quickly.
+
+@lru_cache(maxsize=None)
+def get_console():
+    """Create the shared rich console on first use."""
+    from rich.console import Console
+    return Console()
 
 
 @click.group()
@@ -49,6 +51,12 @@ def submit(
       # Submit multiple kernels from a directory
       leaderboard submit --dsl triton --device A100 --directory generated_kernels/
     """
+    import requests
+    from rich.panel import Panel
+    from rich.table import Table
+    from .submit import submit_single_kernel, submit_directory_kernels
+    console = get_console()
+
     # Check authentication
     token = load_token()
     if not token:
@@ -147,8 +155,10 @@ def submit(
 @click.option('--device', help='Filter by device type')
 @click.option('--status', help='Filter by status (pending, evaluated)')
 @click.option('--limit', default=20, help='Maximum number of results (default: 20)')
+@click.option('--before', help='Only show submissions older than this timestamp (for paging)')
+@click.option('--before-id', type=int, help='Submission ID paired with --before (for paging)')
 @click.option('--endpoint', default='http://localhost:8000', help='API base URL')
-def list(operation: Optional[str], dsl: Optional[str], device: Optional[str], status: Optional[str], limit: int, endpoint: str):
+def list(operation: Optional[str], dsl: Optional[str], device: Optional[str], status: Optional[str], limit: int, before: Optional[str], before_id: Optional[int], endpoint: str):
     """List submitted kernels from the server.
     
     Examples:
@@ -161,7 +171,15 @@ def list(operation: Optional[str], dsl: Optional[str], device: Optional[str], st
       
       # List submissions for a specific operation
       leaderboard list --op add
+      
+      # Fetch the next page after a submission
+      leaderboard list --before 2024-01-01T12:00:00 --before-id 42
     """
+    import requests
+    from rich.panel import Panel
+    from .http import session
+    console = get_console()
+
     try:
         # Build query parameters
         params = {'limit': limit}
@@ -173,9 +191,13 @@ def list(operation: Optional[str], dsl: Optional[str], device: Optional[str], st
             params['device'] = device
         if status:
             params['status'] = status
+        if before:
+            params['before'] = before
+        if before_id is not None:
+            params['before_id'] = before_id
         
         # Query server
-        response = requests.get(f"{endpoint}/api/submissions", params=params)
+        response = session.get(f"{endpoint}/api/submissions", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -225,8 +247,14 @@ def show(submission_id: int, endpoint: str):
     
       leaderboard show 1
     """
+    import requests
+    from rich.panel import Panel
+    from rich.table import Table
+    from .http import session
+    console = get_console()
+
     try:
-        response = requests.get(f"{endpoint}/api/submissions/{submission_id}")
+        response = session.get(f"{endpoint}/api/submissions/{submission_id}")
         response.raise_for_status()
         submission = response.json()
         
@@ -270,6 +298,12 @@ def login(endpoint: str):
     
     Required scopes: read:user, user:email
     """
+    import requests
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from .http import session
+    console = get_console()
+
     console.print("[bold]GitHub Authentication[/bold]\n")
     console.print("Generate a Personal Access Token at: https://github.com/settings/tokens")
     console.print("Required scopes: [cyan]read:user[/cyan], [cyan]user:email[/cyan]\n")
@@ -282,7 +316,7 @@ def login(endpoint: str):
     
     try:
         # Authenticate with server
-        response = requests.post(
+        response = session.post(
             f"{endpoint}/api/auth/github",
             json={"github_token": github_token},
             timeout=10
@@ -315,6 +349,7 @@ def login(endpoint: str):
 @cli.command()
 def logout():
     """Log out and clear authentication token."""
+    console = get_console()
     config = load_config()
     if not config:
         console.print("[yellow]You are not logged in[/yellow]")
@@ -328,6 +363,9 @@ def logout():
 @click.option('--endpoint', default='http://localhost:8000', help='API base URL')
 def whoami(endpoint: str):
     """Show current authenticated user."""
+    from rich.panel import Panel
+    console = get_console()
+
     config = load_config()
     
     if not config:
@@ -352,8 +390,13 @@ def pending(limit: int, endpoint: str):
     
       leaderboard pending
     """
+    import requests
+    from rich.table import Table
+    from .http import session
+    console = get_console()
+
     try:
-        response = requests.get(f"{endpoint}/api/submissions/pending", params={'limit': limit})
+        response = session.get(f"{endpoint}/api/submissions/pending", params={'limit': limit})
         response.raise_for_status()
         data = response.json()
         
@@ -398,8 +441,13 @@ def stats(endpoint: str):
     
       leaderboard stats
     """
+    import requests
+    from rich.panel import Panel
+    from .http import session
+    console = get_console()
+
     try:
-        response = requests.get(f"{endpoint}/api/stats")
+        response = session.get(f"{endpoint}/api/stats")
         response.raise_for_status()
         data = response.json()
         
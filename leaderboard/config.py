@@ -1,6 +1,6 @@
 """Configuration management for storing auth tokens."""
 
-import json
+import orjson
 from pathlib import Path
 from typing import Optional
 
@@ -8,6 +8,9 @@ from typing import Optional
 CONFIG_DIR = Path.home() / ".leaderboard"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Parsed config, reused until the file's mtime changes
+_cache = {"mtime": None, "data": None}
+
 
 def ensure_config_dir():
     """Ensure configuration directory exists."""
@@ -21,37 +24,44 @@ def save_token(token: str, username: str):
         "access_token": token,
         "username": username
     }
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    _invalidate_cache()
 
 
 def load_token() -> Optional[str]:
     """Load authentication token."""
-    if not CONFIG_FILE.exists():
-        return None
-    
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-        return config.get("access_token")
-    except:
-        return None
+    return (load_config() or {}).get("access_token")
 
 
 def load_config() -> Optional[dict]:
     """Load full configuration."""
-    if not CONFIG_FILE.exists():
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
         return None
     
+    if mtime == _cache["mtime"]:
+        return _cache["data"]
+    
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+        data = orjson.loads(CONFIG_FILE.read_bytes())
     except:
         return None
+    
+    _cache["mtime"] = mtime
+    _cache["data"] = data
+    return data
+
+
+def _invalidate_cache():
+    """Drop the cached config so the next load re-reads the file."""
+    _cache["mtime"] = None
+    _cache["data"] = None
 
 
 def clear_token():
     """Clear authentication token."""
     if CONFIG_FILE.exists():
         CONFIG_FILE.unlink()
+    _invalidate_cache()
 
@@ -0,0 +1,14 @@
+"""Shared HTTP session for talking to the leaderboard server."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Retry idempotent requests on transient gateway errors
+_retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_retry)
+
+session = requests.Session()
+session.mount('http://', _adapter)
+session.mount('https://', _adapter)
@@ -1,11 +1,28 @@
 """Submission logic for kernel files."""
 
+import gzip
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 import requests
 
+from .http import session as default_session
+
+
+# Concurrent uploads for directory submissions
+MAX_UPLOAD_WORKERS = 8
+
+# Kernel file names look like "<operation>" or "<operation>_v<N>"
+_KERNEL_NAME_RE = re.compile(r'^([a-zA-Z_]+)(?:_v\d+)?$')
+
+# Kernel source extensions picked up by directory submissions
+_KERNEL_EXTENSIONS = frozenset(('.py', '.cu', '.cpp', '.c', '.cuh', '.h'))
+
+# Common overload types
+_OVERLOAD_TYPES = frozenset(('Tensor', 'Float', 'Int', 'Double', 'Half', 'BFloat16'))
+
 
 def submit_single_kernel(
     operation: str,
@@ -14,7 +31,8 @@ def submit_single_kernel(
     file_path: str,
     token: str,
     overload: Optional[str] = None,
-    endpoint: str = 'http://localhost:8000/api/submit'
+    endpoint: str = 'http://localhost:8000/api/submit',
+    session: Optional[requests.Session] = None
 ) -> Dict:
     """Submit a single kernel file to the server.
     
@@ -25,28 +43,36 @@ def submit_single_kernel(
         file_path: Path to the kernel file
         overload: Optional overload type
         endpoint: API endpoint URL
+        session: Optional session to use instead of the shared one
         
     Returns:
         Dictionary with submission result
     """
     try:
-        # Read file content
-        with open(file_path, 'r') as f:
-            file_content = f.read()
+        # Read and gzip the raw file bytes
+        with open(file_path, 'rb') as f:
+            file_content = gzip.compress(f.read())
         
         file_name = os.path.basename(file_path)
         
-        # Send to server with authentication
+        # Send to server with authentication as multipart/form-data
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.post(
+        http = session or default_session
+        response = http.post(
             endpoint,
-            json={
+            data={
                 'operation': operation,
                 'overload': overload,
                 'dsl': dsl,
-                'device': device,
-                'file_name': file_name,
-                'file_content': file_content
+                'device': device
+            },
+            files={
+                'file': (
+                    file_name,
+                    file_content,
+                    'application/octet-stream',
+                    {'Content-Encoding': 'gzip'}
+                )
             },
             headers=headers,
             timeout=10
@@ -105,10 +131,7 @@ def parse_kernel_info_from_path(file_path: str) -> Dict[str, Optional[str]]:
         parent_name = parts[-2]
         grandparent_name = parts[-3] if len(parts) >= 3 else None
         
-        # Common overload types
-        overload_types = ['Tensor', 'Float', 'Int', 'Double', 'Half', 'BFloat16']
-        
-        if parent_name in overload_types and grandparent_name:
+        if parent_name in _OVERLOAD_TYPES and grandparent_name:
             overload = parent_name
             operation = grandparent_name
         else:
@@ -117,7 +140,7 @@ def parse_kernel_info_from_path(file_path: str) -> Dict[str, Optional[str]]:
     # Try to extract operation from filename if not found
     if not operation:
         file_name = path.stem
-        match = re.match(r'^([a-zA-Z_]+)(?:_v\d+)?$', file_name)
+        match = _KERNEL_NAME_RE.match(file_name)
         if match:
             operation = match.group(1)
     
@@ -145,32 +168,29 @@ def submit_directory_kernels(
     Returns:
         List of submission result dictionaries
     """
-    results = []
-    directory = Path(directory_path)
-    
-    # Find all Python files in the directory (recursively)
-    kernel_files = list(directory.rglob('*.py'))
+    # Find all kernel source files in the directory (recursively) in one walk
+    kernel_files = [
+        Path(root) / name
+        for root, _, names in os.walk(directory_path)
+        for name in names
+        if os.path.splitext(name)[1] in _KERNEL_EXTENSIONS
+    ]
     
-    # Also support other common kernel file extensions
-    for ext in ['*.cu', '*.cpp', '*.c', '*.cuh', '*.h']:
-        kernel_files.extend(directory.rglob(ext))
-    
-    for file_path in kernel_files:
+    def upload_one(file_path: Path) -> Dict:
         # Parse operation and overload from path
         info = parse_kernel_info_from_path(str(file_path))
         operation = info['operation']
         overload = info['overload']
         
         if not operation:
-            results.append({
+            return {
                 'success': False,
                 'error': 'Could not determine operation from path',
                 'file_name': file_path.name
-            })
-            continue
+            }
         
         # Submit the kernel
-        result = submit_single_kernel(
+        return submit_single_kernel(
             operation=operation,
             overload=overload,
             dsl=dsl,
@@ -179,7 +199,9 @@ def submit_directory_kernels(
             token=token,
             endpoint=endpoint
         )
-        
-        results.append(result)
+    
+    # Uploads share the pooled keep-alive connections of the default session
+    with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+        results = list(executor.map(upload_one, kernel_files))
     
     return results
@@ -1,58 +1,135 @@
-import jwt
+import base64
+import binascii
+import hashlib
+import hmac
+import threading
+import time
 import httpx
-from datetime import datetime, timedelta
+import orjson
+from cachetools import TTLCache
 from typing import Optional
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Configuration
 SECRET_KEY = "your-secret-key-change-in-production"  # TODO: Move to environment variable
-ALGORITHM = "HS256"
+# blake2b accepts keys up to 64 bytes; derive a fixed-size one from SECRET_KEY
+SECRET_KEY_BYTES = hashlib.blake2b(SECRET_KEY.encode()).digest()
+TOKEN_MAC_SIZE = 16
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 security = HTTPBearer()
 
+# Recently verified token payloads, keyed by a digest of the token
+_token_cache = TTLCache(maxsize=4096, ttl=60)
+_token_cache_lock = threading.Lock()
+
+# Shared GitHub API client, created on server startup
+_gh_client: Optional[httpx.AsyncClient] = None
+
+
+def _new_github_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url="https://api.github.com",
+        timeout=10,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32)
+    )
+
+
+async def start_github_client():
+    """Open the shared GitHub API client."""
+    global _gh_client
+    if _gh_client is None:
+        _gh_client = _new_github_client()
+
+
+async def close_github_client():
+    """Close the shared GitHub API client."""
+    global _gh_client
+    if _gh_client is not None:
+        await _gh_client.aclose()
+        _gh_client = None
+
 
 async def verify_github_token(github_token: str) -> dict:
     """Verify GitHub token and get user info."""
-    async with httpx.AsyncClient() as client:
-        headers = {
-            "Authorization": f"Bearer {github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        response = await client.get("https://api.github.com/user", headers=headers)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid GitHub token")
-        
-        user_data = response.json()
-        return {
-            "provider": "github",
-            "provider_id": str(user_data["id"]),
-            "username": user_data["login"],
-            "name": user_data.get("name"),
-            "email": user_data.get("email"),
-            "avatar_url": user_data.get("avatar_url")
-        }
+    await start_github_client()
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+    response = await _gh_client.get("/user", headers=headers)
+    
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid GitHub token")
+    
+    user_data = response.json()
+    return {
+        "provider": "github",
+        "provider_id": str(user_data["id"]),
+        "username": user_data["login"],
+        "name": user_data.get("name"),
+        "email": user_data.get("email"),
+        "avatar_url": user_data.get("avatar_url")
+    }
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, key=SECRET_KEY_BYTES, digest_size=TOKEN_MAC_SIZE).digest()
 
 
 def create_access_token(data: dict) -> str:
-    """Create JWT access token."""
+    """Create access token: base64url(payload_json).base64url(blake2b MAC)."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60})
+    payload = orjson.dumps(to_encode)
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
-    """Verify JWT token and return user data."""
+def _decode_token(token: str) -> dict:
+    """Check the token MAC and return its payload."""
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+        encoded_payload, encoded_mac = token.split(".")
+        payload = _b64decode(encoded_payload)
+        mac = _b64decode(encoded_mac)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if not hmac.compare_digest(mac, _sign(payload)):
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    try:
+        data = orjson.loads(payload)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if not isinstance(data, dict) or not isinstance(data.get("exp"), int):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return data
+
 
+def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+    """Verify access token and return user data."""
+    token = credentials.credentials
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    
+    if payload is None:
+        payload = _decode_token(token)
+        with _token_cache_lock:
+            _token_cache[key] = payload
+    
+    if payload["exp"] < time.time():
+        raise HTTPException(status_code=401, detail="Token has expired")
+    return payload
@@ -1,71 +1,325 @@
 """FastAPI server for receiving kernel submissions."""
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, File, Form, Header, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import asyncio
+import hashlib
+import queue
 import sqlite3
+import threading
+import time
+import zlib
 from pathlib import Path
-from datetime import datetime
-from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager, closing, contextmanager, suppress
+
+from auth import (
+    verify_github_token,
+    create_access_token,
+    verify_token,
+    start_github_client,
+    close_github_client,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and close them on shutdown."""
+    open_db_pool()
+    await start_github_client()
+    optimize_task = asyncio.create_task(optimize_db_periodically())
+    try:
+        yield
+    finally:
+        # Wait for the task so a running optimize finishes before the pool closes
+        optimize_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await optimize_task
+        await close_github_client()
+        close_db_pool()
 
-from auth import verify_github_token, create_access_token, verify_token
 
-app = FastAPI(title="Leaderboard API")
+app = FastAPI(title="Leaderboard API", lifespan=lifespan)
 
 # Database setup
 DB_PATH = Path(__file__).parent / "submissions.db"
 
 
+# Per-connection tuning; journal_mode=WAL is persistent on the db file but is
+# cheap to reissue. WAL lets readers run alongside the writer, and
+# synchronous=NORMAL skips the fsync on every commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """Apply the connection PRAGMAs."""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
+# SQLite allows many readers but one writer: readers share a pool of
+# connections (keeping their page caches warm across requests) while all
+# writes go through a single connection guarded by a lock.
+READ_POOL_SIZE = 4
+
+# Prepared statements kept per connection, enough for every list filter
+# combination plus the fixed queries
+CACHED_STATEMENTS = 256
+_read_pool: Optional[queue.Queue] = None
+_write_conn: Optional[sqlite3.Connection] = None
+_write_lock = threading.Lock()
+
+
+def connect_db() -> sqlite3.Connection:
+    """Open a configured database connection."""
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=False, cached_statements=CACHED_STATEMENTS
+    )
+    conn.row_factory = sqlite3.Row
+    configure_connection(conn)
+    return conn
+
+
+def open_db_pool():
+    """Open the reader pool and the writer connection."""
+    global _read_pool, _write_conn
+    _read_pool = queue.Queue(maxsize=READ_POOL_SIZE)
+    for _ in range(READ_POOL_SIZE):
+        _read_pool.put(connect_db())
+    _write_conn = connect_db()
+
+
+def close_db_pool():
+    """Close every pooled connection."""
+    global _read_pool, _write_conn
+    while not _read_pool.empty():
+        _read_pool.get_nowait().close()
+    _write_conn.close()
+    _read_pool = None
+    _write_conn = None
+
+
 @contextmanager
 def get_db():
-    """Database connection context manager."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Borrow a read connection from the pool."""
+    conn = _read_pool.get()
     try:
         yield conn
     finally:
-        conn.close()
+        _read_pool.put(conn)
+
+
+@contextmanager
+def get_write_db():
+    """Hold the writer connection; uncommitted work is rolled back on error."""
+    with _write_lock:
+        try:
+            yield _write_conn
+        except BaseException:
+            _write_conn.rollback()
+            raise
+
+
+SUBMISSIONS_SCHEMA = """
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    overload TEXT,
+    dsl TEXT NOT NULL,
+    device TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    timestamp_ms INTEGER NOT NULL,
+    status TEXT DEFAULT 'pending',
+    evaluation_result TEXT,
+    evaluated_at TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+"""
+
+# Metadata columns returned by the listing endpoints (everything but content)
+SUBMISSION_COLUMNS = """
+    s.id, s.user_id, s.operation, s.overload, s.dsl, s.device, s.file_name,
+    s.timestamp_ms, s.status, s.evaluation_result, s.evaluated_at,
+    u.username, u.name AS user_name
+"""
+
+
+# Submission times are stored as epoch milliseconds and rendered as UTC ISO
+# strings only when a row is returned
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def now_ms() -> int:
+    """Current time in epoch milliseconds."""
+    return int(time.time() * 1000)
+
+
+def format_ms(ts: int) -> str:
+    """Render epoch milliseconds as a UTC ISO 8601 string."""
+    return datetime.fromtimestamp(ts / 1000, tz=timezone.utc).isoformat(timespec="milliseconds")
+
+
+def parse_ms(value: str) -> int:
+    """Parse an ISO 8601 timestamp (UTC unless it carries an offset) to epoch milliseconds."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(milliseconds=1)
+
+
+# strftime() format matching format_ms, for converting naive local times in SQL
+UTC_ISO_FORMAT = "%Y-%m-%dT%H:%M:%f+00:00"
+
+
+def submission_dict(row: sqlite3.Row) -> dict:
+    """Convert a submission row to its API representation."""
+    submission = dict(row)
+    submission["timestamp"] = format_ms(submission["timestamp_ms"])
+    return submission
+
+
+def migrate_submissions(conn: sqlite3.Connection):
+    """Rebuild a submissions table created by an older version of the server.
+    
+    Moves file_content into submission_content and converts the TEXT
+    timestamp column (naive local-time ISO strings) to timestamp_ms. The
+    evaluated_at and users.created_at strings from that era are rewritten
+    as UTC to match what the server writes now.
+    """
+    columns = [row["name"] for row in conn.execute("PRAGMA table_info(submissions)")]
+    if "file_content" not in columns and "timestamp_ms" in columns:
+        return
+    
+    if "timestamp_ms" in columns:
+        timestamp_ms = "timestamp_ms"
+        evaluated_at = "evaluated_at"
+    else:
+        # The 'utc' modifier reads the string as local time
+        timestamp_ms = (
+            "CAST(ROUND((julianday(timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER)"
+        )
+        evaluated_at = f"strftime('{UTC_ISO_FORMAT}', evaluated_at, 'utc')"
+    
+    # Rebuild the table rather than ALTER it; works on any SQLite version
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DROP TABLE IF EXISTS submissions_new")
+        conn.execute(f"CREATE TABLE submissions_new ({SUBMISSIONS_SCHEMA})")
+        if "file_content" in columns:
+            conn.execute("""
+                INSERT OR IGNORE INTO submission_content (submission_id, content)
+                SELECT id, file_content FROM submissions
+            """)
+        conn.execute(f"""
+            INSERT INTO submissions_new
+            (id, user_id, operation, overload, dsl, device, file_name,
+             timestamp_ms, status, evaluation_result, evaluated_at)
+            SELECT id, user_id, operation, overload, dsl, device, file_name,
+                   {timestamp_ms}, status, evaluation_result, {evaluated_at}
+            FROM submissions
+        """)
+        if "timestamp_ms" not in columns:
+            conn.execute(f"""
+                UPDATE users SET created_at = strftime('{UTC_ISO_FORMAT}', created_at, 'utc')
+                WHERE created_at NOT LIKE '%+00:00'
+            """)
+        conn.execute("DROP TABLE submissions")
+        conn.execute("ALTER TABLE submissions_new RENAME TO submissions")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+# Tables, then indexes; each script applies atomically. Existing databases
+# are migrated in between, so the indexes only ever see the current columns.
+TABLES_SQL = f"""
+BEGIN IMMEDIATE;
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    provider TEXT NOT NULL,
+    provider_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    name TEXT,
+    email TEXT,
+    avatar_url TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE(provider, provider_id)
+);
+
+-- Submissions table with user tracking and evaluation status
+CREATE TABLE IF NOT EXISTS submissions ({SUBMISSIONS_SCHEMA});
+
+-- Kernel sources live apart from the metadata rows so listings stay narrow
+CREATE TABLE IF NOT EXISTS submission_content (
+    submission_id INTEGER PRIMARY KEY,
+    content TEXT NOT NULL,
+    FOREIGN KEY (submission_id) REFERENCES submissions (id)
+);
+
+COMMIT;
+"""
+
+INDEXES_SQL = """
+BEGIN IMMEDIATE;
+
+-- Indexes for the pending/status, user JOIN and list filter paths.
+-- (timestamp_ms, id) suffixes match the keyset pagination order.
+DROP INDEX IF EXISTS idx_submissions_status_ts;
+DROP INDEX IF EXISTS idx_submissions_filter;
+CREATE INDEX IF NOT EXISTS idx_submissions_status_ts_id
+ON submissions (status, timestamp_ms DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_user
+ON submissions (user_id);
+CREATE INDEX IF NOT EXISTS idx_submissions_filter_ts_id
+ON submissions (operation, dsl, device, timestamp_ms DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_ts_id
+ON submissions (timestamp_ms DESC, id DESC);
+
+COMMIT;
+"""
 
 
 def init_db():
     """Initialize the database schema."""
-    with get_db() as conn:
-        # Users table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                provider TEXT NOT NULL,
-                provider_id TEXT NOT NULL,
-                username TEXT NOT NULL,
-                name TEXT,
-                email TEXT,
-                avatar_url TEXT,
-                created_at TEXT NOT NULL,
-                UNIQUE(provider, provider_id)
-            )
-        """)
+    with closing(connect_db()) as conn:
+        conn.executescript(TABLES_SQL)
+        migrate_submissions(conn)
+        conn.executescript(INDEXES_SQL)
         
-        # Submissions table with user tracking and evaluation status
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS submissions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                operation TEXT NOT NULL,
-                overload TEXT,
-                dsl TEXT NOT NULL,
-                device TEXT NOT NULL,
-                file_name TEXT NOT NULL,
-                file_content TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                evaluation_result TEXT,
-                evaluated_at TEXT,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
+        # Give the query planner statistics before the first real query
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
         conn.commit()
 
 
+# How often to refresh query planner statistics
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60
+
+
+def optimize_db():
+    """Refresh query planner statistics."""
+    with get_write_db() as conn:
+        conn.execute("PRAGMA optimize")
+
+
+async def optimize_db_periodically():
+    """Run optimize_db every OPTIMIZE_INTERVAL_SECONDS off the event loop."""
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        await run_in_threadpool(optimize_db)
+
+
 # Initialize database on startup
 init_db()
 
@@ -85,6 +339,135 @@ class KernelSubmission(BaseModel):
     file_content: str
 
 
+class KernelSubmissionBatch(BaseModel):
+    """Schema for a batch of kernel submissions."""
+    submissions: List[KernelSubmission]
+
+
+# Response schemas. Typed returns let FastAPI serialize rows straight to JSON
+# bytes through Pydantic instead of walking them with jsonable_encoder.
+class Submission(BaseModel):
+    """Schema for a stored submission, without its source."""
+    id: int
+    user_id: int
+    operation: str
+    overload: Optional[str] = None
+    dsl: str
+    device: str
+    file_name: str
+    timestamp_ms: int
+    timestamp: str
+    status: Optional[str] = None
+    evaluation_result: Optional[str] = None
+    evaluated_at: Optional[str] = None
+    username: str
+    user_name: Optional[str] = None
+
+
+class SubmissionDetail(Submission):
+    """Schema for a stored submission with its source."""
+    file_content: str
+
+
+class SubmissionList(BaseModel):
+    """Schema for a page of submissions."""
+    count: int
+    submissions: List[Submission]
+
+
+# Largest kernel source accepted, after decompression
+MAX_KERNEL_BYTES = 10 * 1024 * 1024
+
+# Most kernels accepted by one /api/submit/batch request
+MAX_BATCH_SIZE = 100
+
+
+def gunzip_kernel(content: bytes) -> bytes:
+    """Decompress a gzip upload, refusing output larger than MAX_KERNEL_BYTES."""
+    decompressor = zlib.decompressobj(wbits=31)
+    try:
+        content = decompressor.decompress(content, MAX_KERNEL_BYTES + 1)
+    except (OSError, EOFError, zlib.error):
+        raise HTTPException(status_code=400, detail="Invalid gzip payload")
+    if len(content) > MAX_KERNEL_BYTES:
+        raise HTTPException(status_code=413, detail="Kernel file too large")
+    if not decompressor.eof:
+        raise HTTPException(status_code=400, detail="Invalid gzip payload")
+    return content
+
+
+async def kernel_submission_form(
+    operation: str = Form(...),
+    overload: Optional[str] = Form(None),
+    dsl: str = Form(...),
+    device: str = Form(...),
+    file: UploadFile = File(...)
+) -> KernelSubmission:
+    """Build a KernelSubmission from a multipart upload, gunzipping the file if needed."""
+    content = await file.read()
+    if file.headers.get("content-encoding") == "gzip":
+        content = gunzip_kernel(content)
+    elif len(content) > MAX_KERNEL_BYTES:
+        raise HTTPException(status_code=413, detail="Kernel file too large")
+    
+    try:
+        file_content = content.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Kernel file must be UTF-8 text")
+    
+    return KernelSubmission(
+        operation=operation,
+        overload=overload,
+        dsl=dsl,
+        device=device,
+        file_name=file.filename,
+        file_content=file_content
+    )
+
+
+# INSERT ... RETURNING needs SQLite 3.35+
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def upsert_user(user_info: dict) -> int:
+    """Store or update a user and return their id."""
+    with get_write_db() as conn:
+        cursor = conn.cursor()
+        params = (
+            user_info["provider"],
+            user_info["provider_id"],
+            user_info["username"],
+            user_info["name"],
+            user_info["email"],
+            user_info["avatar_url"],
+            format_ms(now_ms())
+        )
+        upsert = """
+            INSERT INTO users 
+            (provider, provider_id, username, name, email, avatar_url, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (provider, provider_id) DO UPDATE SET
+                username = excluded.username,
+                name = excluded.name,
+                email = excluded.email,
+                avatar_url = excluded.avatar_url
+        """
+        
+        if SQLITE_HAS_RETURNING:
+            user_id = cursor.execute(upsert + " RETURNING id", params).fetchone()[0]
+        else:
+            cursor.execute(upsert, params)
+            cursor.execute("""
+                SELECT id FROM users 
+                WHERE provider = ? AND provider_id = ?
+            """, (user_info["provider"], user_info["provider_id"]))
+            user_id = cursor.fetchone()["id"]
+        
+        conn.commit()
+    
+    return user_id
+
+
 @app.post("/api/auth/github")
 async def auth_github(auth_request: GitHubAuthRequest):
     """Authenticate user with GitHub token."""
@@ -92,52 +475,10 @@ async def auth_github(auth_request: GitHubAuthRequest):
         # Verify GitHub token and get user info
         user_info = await verify_github_token(auth_request.github_token)
         
-        # Store or update user in database
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            # Check if user exists
-            cursor.execute("""
-                SELECT id FROM users 
-                WHERE provider = ? AND provider_id = ?
-            """, (user_info["provider"], user_info["provider_id"]))
-            
-            existing_user = cursor.fetchone()
-            
-            if existing_user:
-                user_id = existing_user["id"]
-                # Update user info
-                cursor.execute("""
-                    UPDATE users 
-                    SET username = ?, name = ?, email = ?, avatar_url = ?
-                    WHERE id = ?
-                """, (
-                    user_info["username"],
-                    user_info["name"],
-                    user_info["email"],
-                    user_info["avatar_url"],
-                    user_id
-                ))
-            else:
-                # Create new user
-                cursor.execute("""
-                    INSERT INTO users 
-                    (provider, provider_id, username, name, email, avatar_url, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_info["provider"],
-                    user_info["provider_id"],
-                    user_info["username"],
-                    user_info["name"],
-                    user_info["email"],
-                    user_info["avatar_url"],
-                    datetime.now().isoformat()
-                ))
-                user_id = cursor.lastrowid
-            
-            conn.commit()
+        # Store or update user in database without blocking the event loop
+        user_id = await run_in_threadpool(upsert_user, user_info)
         
-        # Create JWT token
+        # Create access token
         access_token = create_access_token({
             "user_id": user_id,
             "username": user_info["username"],
@@ -161,18 +502,18 @@ async def auth_github(auth_request: GitHubAuthRequest):
 
 
 @app.post("/api/submit")
-async def submit_kernel(
-    submission: KernelSubmission,
+def submit_kernel(
+    submission: KernelSubmission = Depends(kernel_submission_form),
     user: dict = Depends(verify_token)
 ):
     """Accept a kernel submission and store it in the database. Requires authentication."""
     try:
-        with get_db() as conn:
+        with get_write_db() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO submissions 
-                (user_id, operation, overload, dsl, device, file_name, file_content, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (user_id, operation, overload, dsl, device, file_name, timestamp_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 user["user_id"],
                 submission.operation,
@@ -180,11 +521,15 @@ async def submit_kernel(
                 submission.dsl,
                 submission.device,
                 submission.file_name,
-                submission.file_content,
-                datetime.now().isoformat()
+                now_ms()
             ))
-            conn.commit()
             submission_id = cursor.lastrowid
+            cursor.execute("""
+                INSERT INTO submission_content (submission_id, content)
+                VALUES (?, ?)
+            """, (submission_id, submission.file_content))
+            conn.commit()
+        invalidate_stats_cache()
         
         return {
             "success": True,
@@ -195,23 +540,101 @@ async def submit_kernel(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/submit/batch")
+def submit_kernel_batch(
+    batch: KernelSubmissionBatch,
+    user: dict = Depends(verify_token)
+):
+    """Store a batch of kernel submissions in one transaction. Requires authentication."""
+    if len(batch.submissions) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_SIZE} kernels per batch"
+        )
+    for submission in batch.submissions:
+        if len(submission.file_content.encode("utf-8")) > MAX_KERNEL_BYTES:
+            raise HTTPException(status_code=413, detail="Kernel file too large")
+    if not batch.submissions:
+        return {"success": True, "ids": [], "message": "No kernels submitted"}
+    
+    try:
+        timestamp_ms = now_ms()
+        with get_write_db() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO submissions 
+                (user_id, operation, overload, dsl, device, file_name, timestamp_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    user["user_id"],
+                    submission.operation,
+                    submission.overload,
+                    submission.dsl,
+                    submission.device,
+                    submission.file_name,
+                    timestamp_ms
+                )
+                for submission in batch.submissions
+            ])
+            # The writer lock and single transaction keep the batch's ids contiguous
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(batch.submissions) + 1, last_id + 1))
+            cursor.executemany("""
+                INSERT INTO submission_content (submission_id, content)
+                VALUES (?, ?)
+            """, [
+                (submission_id, submission.file_content)
+                for submission_id, submission in zip(ids, batch.submissions)
+            ])
+            conn.commit()
+        invalidate_stats_cache()
+        
+        count = len(batch.submissions)
+        return {
+            "success": True,
+            "ids": ids,
+            "message": f"{count} kernel(s) submitted successfully"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/submissions")
-async def list_submissions(
+def list_submissions(
     operation: Optional[str] = None,
     dsl: Optional[str] = None,
     device: Optional[str] = None,
     status: Optional[str] = None,
-    limit: int = 20
-):
-    """List submissions with optional filters."""
-    query = """
-        SELECT s.*, u.username, u.name as user_name
+    limit: int = 20,
+    before: Optional[str] = None,
+    before_id: Optional[int] = None
+) -> SubmissionList:
+    """List submissions with optional filters, newest first.
+    
+    Pass the timestamp and id of the last row of a page as before/before_id
+    to fetch the next page.
+    """
+    if before_id is not None and not before:
+        raise HTTPException(status_code=400, detail="before_id requires before")
+    if before:
+        try:
+            before_ms = parse_ms(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid before timestamp")
+    
+    query = f"""
+        SELECT {SUBMISSION_COLUMNS}
         FROM submissions s
         JOIN users u ON s.user_id = u.id
         WHERE 1=1
     """
     params = []
     
+    # Clauses are appended in a fixed order, so each filter combination maps
+    # to one SQL string and hits the connection's prepared statement cache.
+    # Unlike "(? IS NULL OR ...)" templates, the planner still sees the real
+    # equality columns and can seek idx_submissions_filter_ts_id.
     if operation:
         query += " AND s.operation = ?"
         params.append(operation)
@@ -224,8 +647,14 @@ async def list_submissions(
     if status:
         query += " AND s.status = ?"
         params.append(status)
+    if before and before_id is not None:
+        query += " AND (s.timestamp_ms, s.id) < (?, ?)"
+        params.extend([before_ms, before_id])
+    elif before:
+        query += " AND s.timestamp_ms < ?"
+        params.append(before_ms)
     
-    query += " ORDER BY s.timestamp DESC LIMIT ?"
+    query += " ORDER BY s.timestamp_ms DESC, s.id DESC LIMIT ?"
     params.append(limit)
     
     with get_db() as conn:
@@ -234,38 +663,82 @@ async def list_submissions(
         
     return {
         "count": len(rows),
-        "submissions": [dict(row) for row in rows]
+        "submissions": [submission_dict(row) for row in rows]
     }
 
 
 @app.get("/api/submissions/pending")
-async def get_pending_submissions(limit: Optional[int] = 20):
+def get_pending_submissions(limit: Optional[int] = 20) -> SubmissionList:
     """Get submissions that haven't been evaluated yet."""
     with get_db() as conn:
-        cursor = conn.execute("""
-            SELECT s.*, u.username, u.name as user_name
+        cursor = conn.execute(f"""
+            SELECT {SUBMISSION_COLUMNS}
             FROM submissions s
             JOIN users u ON s.user_id = u.id
             WHERE s.status = 'pending'
-            ORDER BY s.timestamp ASC
+            ORDER BY s.timestamp_ms ASC, s.id ASC
             LIMIT ?
         """, (limit,))
         rows = cursor.fetchall()
     
     return {
         "count": len(rows),
-        "submissions": [dict(row) for row in rows]
+        "submissions": [submission_dict(row) for row in rows]
     }
 
 
-@app.get("/api/submissions/{submission_id}")
-async def get_submission(submission_id: int):
-    """Get a specific submission by ID."""
+def submission_etag(row: sqlite3.Row) -> str:
+    """ETag for a submission from the fields that can change after submit.
+    
+    Those are the evaluation fields and the joined user names, which
+    upsert_user refreshes on every login.
+    """
+    key = f"{row['status']}|{row['evaluated_at']}|{row['username']}|{row['user_name']}"
+    digest = hashlib.blake2s(key.encode()).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Whether an If-None-Match header covers etag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# 304s are returned as a bare Response, so the model is set on the route
+@app.get("/api/submissions/{submission_id}", response_model=SubmissionDetail)
+def get_submission(
+    submission_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get a specific submission by ID.
+    
+    Responses carry an ETag; clients polling for evaluation can send it back
+    in If-None-Match and get a 304 without the content being read.
+    """
     with get_db() as conn:
-        cursor = conn.execute("""
-            SELECT s.*, u.username, u.name as user_name
+        if if_none_match:
+            row = conn.execute("""
+                SELECT s.status, s.evaluated_at, u.username, u.name AS user_name
+                FROM submissions s
+                JOIN users u ON s.user_id = u.id
+                WHERE s.id = ?
+            """, (submission_id,)).fetchone()
+            if row:
+                etag = submission_etag(row)
+                if etag_matches(etag, if_none_match):
+                    return Response(status_code=304, headers={
+                        "ETag": etag,
+                        "Cache-Control": "no-cache, must-revalidate"
+                    })
+        
+        cursor = conn.execute(f"""
+            SELECT {SUBMISSION_COLUMNS}, c.content AS file_content
             FROM submissions s
             JOIN users u ON s.user_id = u.id
+            JOIN submission_content c ON c.submission_id = s.id
             WHERE s.id = ?
         """, (submission_id,))
         row = cursor.fetchone()
@@ -273,65 +746,98 @@ async def get_submission(submission_id: int):
     if not row:
         raise HTTPException(status_code=404, detail="Submission not found")
     
-    return dict(row)
+    response.headers["ETag"] = submission_etag(row)
+    response.headers["Cache-Control"] = "no-cache, must-revalidate"
+    return submission_dict(row)
 
 
 @app.post("/api/submissions/{submission_id}/evaluate")
-async def mark_evaluated(
+def mark_evaluated(
     submission_id: int,
     result: Optional[str] = None,
     user: dict = Depends(verify_token)
 ):
     """Mark a submission as evaluated. Requires authentication."""
-    with get_db() as conn:
+    with get_write_db() as conn:
         cursor = conn.cursor()
         
-        # Check if submission exists
-        cursor.execute("SELECT id FROM submissions WHERE id = ?", (submission_id,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Submission not found")
-        
-        # Update status
+        # Update status; re-evaluating an evaluated submission is a no-op
         cursor.execute("""
             UPDATE submissions 
             SET status = 'evaluated', 
                 evaluation_result = ?,
                 evaluated_at = ?
-            WHERE id = ?
-        """, (result, datetime.now().isoformat(), submission_id))
+            WHERE id = ? AND status != 'evaluated'
+        """, (result, format_ms(now_ms()), submission_id))
+        
+        updated = cursor.rowcount
         conn.commit()
+        
+        if not updated:
+            # Only this rare path pays for a second lookup
+            cursor.execute("SELECT 1 FROM submissions WHERE id = ?", (submission_id,))
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="Submission not found")
+            return {"success": True, "message": "Submission already evaluated"}
+    invalidate_stats_cache()
     
     return {"success": True, "message": "Submission marked as evaluated"}
 
 
+# Stats are served from memory for this long; writes invalidate them early
+STATS_TTL_SECONDS = 5.0
+_stats_cache = {"ts": 0.0, "data": None, "generation": 0}
+_stats_lock = threading.Lock()
+# Separate from _stats_lock so writers never wait on a running recompute
+_stats_generation_lock = threading.Lock()
+
+
+def invalidate_stats_cache():
+    """Force the next /api/stats request to recompute.
+    
+    Bumping the generation also stops a recompute that is already running,
+    and may have read the pre-write snapshot, from being cached.
+    """
+    with _stats_generation_lock:
+        _stats_cache["generation"] += 1
+        _stats_cache["ts"] = 0.0
+
+
 @app.get("/api/stats")
-async def get_stats():
+def get_stats(response: Response):
     """Get statistics about submissions."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Total submissions
-        cursor.execute("SELECT COUNT(*) as total FROM submissions")
-        total = cursor.fetchone()["total"]
+    response.headers["Cache-Control"] = f"public, max-age={int(STATS_TTL_SECONDS)}"
+    
+    with _stats_lock:
+        if time.monotonic() - _stats_cache["ts"] < STATS_TTL_SECONDS:
+            return _stats_cache["data"]
         
-        # Pending submissions
-        cursor.execute("SELECT COUNT(*) as pending FROM submissions WHERE status = 'pending'")
-        pending = cursor.fetchone()["pending"]
+        generation = _stats_cache["generation"]
+        with get_db() as conn:
+            # Submission counts per status in one pass
+            rows = conn.execute("""
+                SELECT status, COUNT(*) AS c FROM submissions GROUP BY status
+            """).fetchall()
+            counts = {row["status"]: row["c"] for row in rows}
+            
+            # Total users
+            users = conn.execute("SELECT COUNT(*) AS users FROM users").fetchone()["users"]
         
-        # Evaluated submissions
-        cursor.execute("SELECT COUNT(*) as evaluated FROM submissions WHERE status = 'evaluated'")
-        evaluated = cursor.fetchone()["evaluated"]
+        total = sum(counts.values())
+        pending = counts.get("pending", 0)
+        evaluated = counts.get("evaluated", 0)
         
-        # Total users
-        cursor.execute("SELECT COUNT(*) as users FROM users")
-        users = cursor.fetchone()["users"]
-    
-    return {
-        "total_submissions": total,
-        "pending_evaluations": pending,
-        "evaluated": evaluated,
-        "total_users": users
-    }
+        data = {
+            "total_submissions": total,
+            "pending_evaluations": pending,
+            "evaluated": evaluated,
+            "total_users": users
+        }
+        with _stats_generation_lock:
+            if _stats_cache["generation"] == generation:
+                _stats_cache["data"] = data
+                _stats_cache["ts"] = time.monotonic()
+        return data
 
 
 @app.get("/")
@@ -341,6 +847,7 @@ async def root():
         "message": "Leaderboard API",
         "endpoints": {
             "submit": "POST /api/submit",
+            "submit_batch": "POST /api/submit/batch",
             "list": "GET /api/submissions",
             "pending": "GET /api/submissions/pending",
             "get": "GET /api/submissions/{id}",
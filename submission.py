@@ -5,25 +5,83 @@ import triton.language as tl
 from task import input_t, output_t
 
 
+@triton.autotune(
+    configs=[
+        triton.Config({'BLOCK_SIZE': b}, num_warps=w, num_stages=s)
+        for b, w, s in [
+            (1024, 4, 2),
+            (2048, 4, 3),
+            (4096, 8, 3),
+            (8192, 8, 4),
+            (16384, 8, 4),
+        ]
+    ],
+    key=['n'],
+)
+# only inputs that don't split evenly into blocks need the tail mask
+@triton.heuristics({'HAS_TAIL': lambda args: args['n'] % args['BLOCK_SIZE'] != 0})
 @triton.jit
-def add_kernel(a_ptr, b_ptr, c_ptr, n, BLOCK_SIZE: tl.constexpr):
+def add_kernel(a_ptr, b_ptr, c_ptr, n, BLOCK_SIZE: tl.constexpr, HAS_TAIL: tl.constexpr):
     pid = tl.program_id(0)
-    offsets = pid * BLOCK_SIZE + tl.arange(0, BLOCK_SIZE)
-    mask = offsets < n
-    # alignment hints
-    tl.multiple_of(offsets, 32)
-    tl.multiple_of(a_ptr, 32)
-    tl.multiple_of(b_ptr, 32)
-    tl.multiple_of(c_ptr, 32)
-    a = tl.load(a_ptr + offsets, mask=mask)
-    b = tl.load(b_ptr + offsets, mask=mask)
-    tl.store(c_ptr + offsets, a + b, mask=mask)
+    # alignment hints: each block is a contiguous BLOCK_SIZE-aligned run, so
+    # loads vectorize to 128-bit accesses. Pointer args are already
+    # specialized as 16-byte aligned by the JIT.
+    offsets = tl.max_contiguous(
+        tl.multiple_of(pid * BLOCK_SIZE + tl.arange(0, BLOCK_SIZE), BLOCK_SIZE),
+        BLOCK_SIZE,
+    )
+    if HAS_TAIL:
+        mask = offsets < n
+        a = tl.load(a_ptr + offsets, mask=mask, other=0.0)
+        b = tl.load(b_ptr + offsets, mask=mask, other=0.0)
+        tl.store(c_ptr + offsets, a + b, mask=mask)
+    else:
+        a = tl.load(a_ptr + offsets)
+        b = tl.load(b_ptr + offsets)
+        tl.store(c_ptr + offsets, a + b)
+
+
+def _cpu_add(A, B, C):
+    # Triton can't launch on CPU tensors. torch.add already reads A and B once
+    # and writes C once in their own dtype; bf16/fp16 inputs get the narrow
+    # bandwidth without any cast (a downcast here would only add traffic)
+    torch.add(A, B, out=C)
+    return C
 
 
 def custom_kernel(data: input_t) -> output_t:
     A, B, C = data
+    if A.device.type == 'cpu':
+        return _cpu_add(A, B, C)
     n = A.numel()
-    BLOCK_SIZE = 4096
-    grid = (triton.cdiv(n, BLOCK_SIZE),)
-    add_kernel[grid](A, B, C, n, BLOCK_SIZE, num_warps=8, num_stages=3)
+    grid = lambda meta: (triton.cdiv(n, meta['BLOCK_SIZE']),)
+    add_kernel[grid](A, B, C, n)
     return C
+
+
+# one compiled graph per post_op, so switching ops never recompiles (or
+# evicts) another op's graph
+_fused = {}
+
+
+def _add_then(post_op):
+    if post_op not in _fused:
+        @torch.compile(fullgraph=True)
+        def add_then(A, B, C):
+            # Inductor fuses the add, post_op and the write into C into one kernel
+            C.copy_(post_op(A + B))
+            return C
+        _fused[post_op] = add_then
+    return _fused[post_op]
+
+
+def custom_kernel_fused(data: input_t, post_op) -> output_t:
+    """C = post_op(A + B) in a single pass over memory.
+
+    Use when the add feeds another elementwise op; for a plain add,
+    custom_kernel is already a single load-load-store pass. post_op is
+    compiled once per callable, so pass a stable function (e.g. torch.relu
+    or a module-level def) rather than a fresh lambda per call.
+    """
+    A, B, C = data
+    return _add_then(post_op)(A, B, C)